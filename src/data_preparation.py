@@ -4,6 +4,7 @@ from prefect import flow, task
 from sklearn.preprocessing import OrdinalEncoder
 from typing import Dict
 from src.utils.s3_io import upload_df_to_s3, upload_joblib_to_s3
+from src.utils.drift import build_reference_profile
 import yfinance as yf
 import pandas as pd
 from datetime import datetime
@@ -16,6 +17,7 @@ START_DATE = "2025-01-01"
 END_DATE = datetime.today().strftime("%Y-%m-%d")
 RAW_EXPORT_DIR = "data/train/raw"
 PROCESSED_EXPORT_DIR = "data/train/processed"
+DRIFT_REFERENCE_PATH = "drift/reference_profile.joblib"
 
 
 @materialize("s3://zoomcamps-bucket/data/train/raw")
@@ -149,6 +151,16 @@ def export_encoder(encoder, remote_path="encoder.joblib"):
     upload_joblib_to_s3(encoder, remote_path)
 
 
+@task(name="Export Drift Reference Profile")
+def export_reference_profile(train_df: pd.DataFrame, remote_path=DRIFT_REFERENCE_PATH):
+    feature_cols = train_df.columns.difference(
+        ["Date", "Ticker", "Ticker_ohe", "Next_Close"]
+    ).tolist()
+    profile = build_reference_profile(train_df, feature_cols)
+    upload_joblib_to_s3(profile, remote_path)
+    logger.info(f"Uploaded drift reference profile to S3: {remote_path}")
+
+
 @flow(name="Data Preparation Flow")
 def data_preparation_flow():
     logger.info("Starting data preparation flow...")
@@ -156,6 +168,7 @@ def data_preparation_flow():
     train_df, test_df, encoder = process_data(raw_data)
     export_data(train_df, test_df)
     export_encoder(encoder)
+    export_reference_profile(train_df)
     logger.info("Data preparation flow completed successfully.")
 
 
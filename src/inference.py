@@ -1,7 +1,19 @@
 from prefect.assets import materialize
 from prefect.artifacts import create_table_artifact, create_markdown_artifact
-from src.data_preparation import process_data
-from src.utils.s3_io import upload_df_to_s3, download_joblib_from_s3
+from src.data_preparation import process_data, DRIFT_REFERENCE_PATH
+from src.utils.s3_io import (
+    upload_df_to_s3,
+    download_joblib_from_s3,
+    upload_joblib_to_s3,
+    is_missing_object_error,
+)
+from src.utils.drift import (
+    QUANTILES,
+    quantile_column,
+    update_running_stats,
+    compute_drift_metrics,
+)
+from prometheus_client import CollectorRegistry, Gauge, push_to_gateway
 import mlflow
 import pandas as pd
 import yfinance as yf
@@ -9,6 +21,7 @@ from datetime import datetime, timedelta
 from typing import Dict
 from prefect import flow, task
 from src.utils.logger import get_logger
+from src.utils.mlflow import is_missing_alias_error
 
 logger = get_logger(__name__)
 
@@ -17,6 +30,9 @@ INFER_RAW_DIR = "data/inference/raw"
 INFER_PROCESSED_DIR = "data/inference/processed"
 PREDICTION_DIR = "data/inference/prediction"
 ENCODER_PATH = "encoder.joblib"
+DRIFT_STATE_PATH = "drift/running_state.joblib"
+REGISTER_NAME = "stock-ema-model"
+CHAMPION_ALIAS = "champion"
 TODAY = datetime.today().strftime("%Y-%m-%d")
 YESTERDAY = (datetime.today() - timedelta(days=1)).strftime("%Y-%m-%d")
 MLFLOW_DB_URI = (
@@ -26,15 +42,63 @@ MLFLOW_DB_URI = (
 )
 
 
-@task(name="Load Model from Registry")
-def load_model_from_registry(registered_model_name="stock-ema-model"):
+def build_model_uri(registered_model_name=REGISTER_NAME, version="latest"):
+    version = str(version)
+    if version == "latest" or version.isdigit():
+        return f"models:/{registered_model_name}/{version}"
+    return f"models:/{registered_model_name}@{version}"
+
+
+def resolve_model_version(version, registered_model_name=REGISTER_NAME, client=None):
+    # Aliases and "latest" move over time, so results are recorded against the
+    # concrete version number they pointed to.
+    version = str(version)
+    if version.isdigit():
+        return version
+
+    if client is None:
+        mlflow.set_registry_uri(MLFLOW_DB_URI)
+        client = mlflow.tracking.MlflowClient()
+    if version == "latest":
+        model_versions = client.search_model_versions(f"name='{registered_model_name}'")
+        return str(max(int(mv.version) for mv in model_versions))
+    return str(
+        client.get_model_version_by_alias(registered_model_name, version).version
+    )
+
+
+def _load_model(registered_model_name, version, dst_path):
     mlflow.set_registry_uri(MLFLOW_DB_URI)
-    model_uri = f"models:/{registered_model_name}/latest"
-    model = mlflow.sklearn.load_model(model_uri, dst_path="./registered_model")
-    logger.info("Successfully logging model from registry.")
+    model_uri = build_model_uri(registered_model_name, version)
+    model = mlflow.sklearn.load_model(model_uri, dst_path=dst_path)
+    logger.info(f"Successfully loaded model {model_uri} from registry.")
     return model
 
 
+@task(name="Load Model from Registry")
+def load_model_from_registry(
+    registered_model_name=REGISTER_NAME,
+    version="latest",
+    dst_path="./registered_model",
+):
+    return _load_model(registered_model_name, version, dst_path)
+
+
+@task(name="Load Serving Model")
+def load_serving_model(
+    registered_model_name=REGISTER_NAME, dst_path="./registered_model"
+):
+    # Serve whatever holds the champion alias; until a first promotion has
+    # happened, fall back to the newest registered version.
+    try:
+        return _load_model(registered_model_name, CHAMPION_ALIAS, dst_path)
+    except Exception as e:
+        if not is_missing_alias_error(e):
+            raise
+        logger.info(f"No {CHAMPION_ALIAS} alias yet, serving latest version.")
+        return _load_model(registered_model_name, "latest", dst_path)
+
+
 @task(name="Load Encoder")
 def load_encoder(remote_path=ENCODER_PATH):
     return download_joblib_from_s3(remote_path)
@@ -157,15 +221,108 @@ def export_prediction(df_prediction: pd.DataFrame):
     logger.info(f"Prediction saved at {s3_path}")
 
 
+def push_drift_metrics(df_drift: pd.DataFrame):
+    registry = CollectorRegistry()
+    labels = ["ticker", "column"]
+    psi_metric = Gauge(
+        "stock_forecast_drift_psi",
+        "PSI since the last reference reset, once enough rows accumulated",
+        labels,
+        registry=registry,
+    )
+    mean_metric = Gauge(
+        "stock_forecast_drift_mean",
+        "Running mean since reference",
+        labels,
+        registry=registry,
+    )
+    variance_metric = Gauge(
+        "stock_forecast_drift_variance",
+        "Running variance since reference",
+        labels,
+        registry=registry,
+    )
+    count_metric = Gauge(
+        "stock_forecast_drift_count",
+        "Observations accumulated since reference",
+        labels,
+        registry=registry,
+    )
+    quantile_metric = Gauge(
+        "stock_forecast_drift_quantile",
+        "Sketched quantile since reference",
+        labels + ["quantile"],
+        registry=registry,
+    )
+    for row in df_drift.to_dict(orient="records"):
+        label_values = (row["Ticker"], row["Column"])
+        if not pd.isna(row["PSI"]):
+            psi_metric.labels(*label_values).set(row["PSI"])
+        mean_metric.labels(*label_values).set(row["Mean"])
+        variance_metric.labels(*label_values).set(row["Variance"])
+        count_metric.labels(*label_values).set(row["Count"])
+        for q in QUANTILES:
+            quantile_metric.labels(*label_values, str(q)).set(row[quantile_column(q)])
+
+    push_to_gateway("localhost:9091", job="stock_forecast_drift", registry=registry)
+
+
+def _load_drift_state():
+    # Only a missing object means there is no state yet; any other error must
+    # not be mistaken for it, or the accumulated counts would be overwritten.
+    try:
+        return download_joblib_from_s3(DRIFT_STATE_PATH)
+    except Exception as e:
+        if not is_missing_object_error(e):
+            raise
+        logger.info("No running drift state found, starting a new one.")
+        return None
+
+
+@task(name="Update Drift Statistics")
+def update_drift_statistics(df_infer: pd.DataFrame, df_prediction: pd.DataFrame):
+    # Monitoring must never fail the daily forecast, so any failure here
+    # degrades to a warning.
+    try:
+        profile = download_joblib_from_s3(DRIFT_REFERENCE_PATH)
+        state = _load_drift_state()
+
+        df_monitor = df_infer.assign(Prediction=df_prediction["Prediction"].values)
+        state = update_running_stats(state, df_monitor, profile)
+        upload_joblib_to_s3(state, DRIFT_STATE_PATH)
+
+        df_drift = compute_drift_metrics(state, profile)
+        if df_drift.empty:
+            logger.info("No drift statistics to report yet.")
+            return df_drift
+
+        create_table_artifact(
+            key="drift-statistics",
+            table=df_drift.round(4)
+            .astype(object)
+            .where(df_drift.notna(), None)
+            .to_dict(orient="records"),
+            description="Running drift statistics against training reference",
+        )
+        push_drift_metrics(df_drift)
+        logger.info(f"Pushed drift statistics for {len(df_drift)} series")
+    except Exception as e:
+        logger.warning(f"Drift statistics update failed, skipping: {e}")
+        return None
+
+    return df_drift
+
+
 @flow(name="Inference Flow")
 def inference_flow():
-    model = load_model_from_registry()
+    model = load_serving_model()
     encoder = load_encoder()
     raw_data = load_inference_data()
     df_infer, _ = process_data(raw_data, for_inference=True, encoder=encoder)
     export_processed_inference_data(df_infer)
     df_prediction = run_batch_prediction(model, df_infer)
     export_prediction(df_prediction)
+    update_drift_statistics(df_infer, df_prediction)
     logger.info("Inference Flow completed successfully.")
     return df_prediction
 
@@ -1,8 +1,15 @@
 import random
+import pandas as pd
 from prefect import flow
+from prefect.artifacts import create_table_artifact
 from src.data_preparation import data_preparation_flow
-from src.models.train import load_data
-from src.inference import load_model_from_registry, run_batch_prediction
+from src.models.train import load_data, TARGET
+from src.inference import (
+    load_model_from_registry,
+    load_serving_model,
+    resolve_model_version,
+    run_batch_prediction,
+)
 from sklearn.metrics import root_mean_squared_error
 from prometheus_client import CollectorRegistry, Gauge, push_to_gateway
 from src.utils.logger import get_logger
@@ -14,7 +21,7 @@ logger = get_logger(__name__)
 def evaluate_model_flow():
     data_preparation_flow()
     _, df_tst = load_data()
-    model = load_model_from_registry()
+    model = load_serving_model()
     y_pred = run_batch_prediction(model=model, df_infer=df_tst, for_evaluate=True)[
         "Prediction"
     ]
@@ -33,6 +40,93 @@ def evaluate_model_flow():
     return rmse_value
 
 
+def build_comparison_table(df_tst: pd.DataFrame, predictions: dict) -> pd.DataFrame:
+    rows = []
+    for version, y_pred in predictions.items():
+        df_scored = pd.DataFrame(
+            {
+                "Ticker": df_tst["Ticker"].values,
+                "y_true": df_tst[TARGET].values,
+                "y_pred": y_pred,
+            }
+        )
+        for ticker, group in df_scored.groupby("Ticker"):
+            rows.append(
+                {
+                    "Version": str(version),
+                    "Ticker": ticker,
+                    "RMSE": root_mean_squared_error(group["y_true"], group["y_pred"]),
+                }
+            )
+        rows.append(
+            {
+                "Version": str(version),
+                "Ticker": "ALL",
+                "RMSE": root_mean_squared_error(
+                    df_scored["y_true"], df_scored["y_pred"]
+                ),
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+@flow(name="Compare Registered Models")
+def evaluate_models_flow(versions=("latest",), prepare_data=False):
+    # Versions may be registry version numbers, "latest" or aliases such as
+    # "champion"; they are resolved to version numbers so results stay
+    # traceable after an alias moves. The test set is loaded once and shared
+    # by all models. Re-preparing data also rewrites the encoder and the drift
+    # reference, so it is opt-in.
+    requested = [str(version) for version in versions]
+    versions = list(dict.fromkeys(resolve_model_version(v) for v in requested))
+    logger.info(f"Comparing versions {versions} (requested {requested})")
+    if prepare_data:
+        data_preparation_flow()
+    _, df_tst = load_data()
+
+    model_futures = {
+        version: load_model_from_registry.submit(version=version, dst_path=None)
+        for version in versions
+    }
+    prediction_futures = {
+        version: run_batch_prediction.submit(model_future, df_tst, for_evaluate=True)
+        for version, model_future in model_futures.items()
+    }
+    predictions = {
+        version: future.result()["Prediction"].values
+        for version, future in prediction_futures.items()
+    }
+
+    df_comparison = build_comparison_table(df_tst, predictions)
+    create_table_artifact(
+        key="model-comparison",
+        table=df_comparison.round(4).to_dict(orient="records"),
+        description="Per-version, per-ticker RMSE on test data",
+    )
+
+    registry = CollectorRegistry()
+    rmse_metric = Gauge(
+        "stock_forecast_model_rmse",
+        "RMSE on test data per model version and ticker",
+        ["version", "ticker"],
+        registry=registry,
+    )
+    for row in df_comparison.to_dict(orient="records"):
+        rmse_metric.labels(row["Version"], row["Ticker"]).set(row["RMSE"])
+
+    # A monitoring outage must not block callers such as model promotion.
+    try:
+        push_to_gateway(
+            "localhost:9091", job="stock_forecast_model_comparison", registry=registry
+        )
+        logger.info(f"Pushed RMSE comparison for versions {versions} to Pushgateway")
+    except Exception as e:
+        logger.warning(f"Failed to push RMSE comparison to Pushgateway: {e}")
+
+    return df_comparison
+
+
 def alert_triggered():
     rmse_value = random.randint(21, 30)
 
@@ -0,0 +1,196 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+N_BINS = 10
+QUANTILES = [0.05, 0.5, 0.95]
+PREDICTION_COL = "Prediction"
+# Sampling noise alone gives PSI of roughly (bins - 1) / n; it is subtracted,
+# but below this many observations PSI is still too noisy to report.
+MIN_PSI_COUNT = 10 * N_BINS
+SMOOTHING = 1.0
+
+
+def _column_reference(values: np.ndarray, n_bins: int) -> dict:
+    # Interior quantile edges of the training distribution; every later
+    # observation is bucketed against these, so the histogram doubles as a
+    # fixed-size quantile sketch that can be merged run after run.
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    counts = np.bincount(
+        np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1
+    )
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "variance": float(values.var()),
+        "edges": edges,
+        "proportions": counts / counts.sum(),
+    }
+
+
+def build_reference_profile(
+    df: pd.DataFrame,
+    feature_cols: list,
+    prediction_ref_col: str = "Next_Close",
+    n_bins: int = N_BINS,
+) -> dict:
+    # There is no model at data preparation time, so the target column stands
+    # in as the reference distribution for predictions.
+    tickers = {}
+    for ticker, group in df.groupby("Ticker"):
+        columns = {}
+        for col in feature_cols:
+            columns[col] = _column_reference(
+                group[col].dropna().to_numpy(dtype=float), n_bins
+            )
+        columns[PREDICTION_COL] = _column_reference(
+            group[prediction_ref_col].dropna().to_numpy(dtype=float), n_bins
+        )
+        tickers[ticker] = columns
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "version": _profile_hash(tickers),
+        "tickers": tickers,
+    }
+
+
+def _profile_hash(tickers: dict) -> str:
+    # Running state is only reset when the reference distribution itself
+    # changes, not every time data preparation re-exports the same profile.
+    digest = hashlib.sha256()
+    for ticker in sorted(tickers):
+        for col in sorted(tickers[ticker]):
+            reference = tickers[ticker][col]
+            digest.update(f"{ticker}/{col}".encode())
+            digest.update(np.asarray(reference["edges"], dtype=float).tobytes())
+            digest.update(np.asarray(reference["proportions"], dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def quantile_column(q: float) -> str:
+    return f"P{int(round(q * 100))}"
+
+
+def _empty_column_state(n_buckets: int) -> dict:
+    return {
+        "count": 0,
+        "mean": 0.0,
+        "m2": 0.0,
+        "min": np.inf,
+        "max": -np.inf,
+        "bin_counts": np.zeros(n_buckets, dtype=np.int64),
+    }
+
+
+def _update_column_state(state: dict, values: np.ndarray, edges: np.ndarray):
+    # Chan et al. parallel update: merge the batch moments into the running
+    # ones without revisiting past observations.
+    n_a, n_b = state["count"], values.size
+    mean_b = values.mean()
+    m2_b = ((values - mean_b) ** 2).sum()
+    n = n_a + n_b
+    delta = mean_b - state["mean"]
+
+    state["mean"] += delta * n_b / n
+    state["m2"] += m2_b + delta**2 * n_a * n_b / n
+    state["count"] = n
+    state["min"] = min(state["min"], float(values.min()))
+    state["max"] = max(state["max"], float(values.max()))
+    state["bin_counts"] += np.bincount(
+        np.searchsorted(edges, values, side="right"),
+        minlength=len(edges) + 1,
+    )
+
+
+def update_running_stats(state, df: pd.DataFrame, profile: dict) -> dict:
+    if state is None or state.get("reference") != profile["version"]:
+        state = {"reference": profile["version"], "tickers": {}}
+
+    for ticker, group in df.groupby("Ticker"):
+        if ticker not in profile["tickers"]:
+            continue
+
+        ticker_state = state["tickers"].setdefault(ticker, {"last_date": None})
+        if ticker_state["last_date"] is not None:
+            group = group[group["Date"] > ticker_state["last_date"]]
+        if group.empty:
+            continue
+
+        for col, reference in profile["tickers"][ticker].items():
+            if col not in group.columns:
+                continue
+            values = group[col].dropna().to_numpy(dtype=float)
+            if values.size == 0:
+                continue
+            col_state = ticker_state.setdefault(
+                col, _empty_column_state(len(reference["edges"]) + 1)
+            )
+            _update_column_state(col_state, values, reference["edges"])
+
+        ticker_state["last_date"] = group["Date"].max()
+
+    return state
+
+
+def _smoothed_proportions(counts: np.ndarray, alpha: float) -> np.ndarray:
+    return (counts + alpha) / (counts.sum() + alpha * len(counts))
+
+
+def population_stability_index(
+    expected_counts: np.ndarray,
+    actual_counts: np.ndarray,
+    min_count: int = MIN_PSI_COUNT,
+    alpha: float = SMOOTHING,
+) -> float:
+    n_actual, n_expected = actual_counts.sum(), expected_counts.sum()
+    if n_actual < min_count:
+        return np.nan
+    expected = _smoothed_proportions(expected_counts, alpha)
+    actual = _smoothed_proportions(actual_counts, alpha)
+    psi = ((actual - expected) * np.log(actual / expected)).sum()
+    # Subtract the PSI expected from sampling noise between two finite samples
+    # of the same distribution, so an undrifted series sits near zero.
+    noise_floor = (len(actual_counts) - 1) * (1 / n_actual + 1 / n_expected)
+    return float(max(psi - noise_floor, 0.0))
+
+
+def _sketch_quantiles(col_state: dict, edges: np.ndarray, quantiles) -> np.ndarray:
+    lower = min(col_state["min"], edges[0]) if len(edges) else col_state["min"]
+    upper = max(col_state["max"], edges[-1]) if len(edges) else col_state["max"]
+    bounds = np.concatenate([[lower], edges, [upper]])
+    cdf = np.concatenate([[0.0], np.cumsum(col_state["bin_counts"])])
+    cdf = cdf / cdf[-1]
+    return np.interp(quantiles, cdf, bounds)
+
+
+def compute_drift_metrics(
+    state: dict, profile: dict, quantiles=QUANTILES
+) -> pd.DataFrame:
+    rows = []
+    for ticker, ticker_state in state["tickers"].items():
+        for col, reference in profile["tickers"][ticker].items():
+            col_state = ticker_state.get(col)
+            if col_state is None or col_state["count"] == 0:
+                continue
+
+            row = {
+                "Ticker": ticker,
+                "Column": col,
+                "Count": col_state["count"],
+                "Mean": col_state["mean"],
+                "Variance": col_state["m2"] / col_state["count"],
+                "Reference_Mean": reference["mean"],
+                "Reference_Variance": reference["variance"],
+                "PSI": population_stability_index(
+                    reference["proportions"] * reference["count"],
+                    col_state["bin_counts"],
+                ),
+            }
+            estimates = _sketch_quantiles(col_state, reference["edges"], quantiles)
+            for q, value in zip(quantiles, estimates):
+                row[quantile_column(q)] = float(value)
+            rows.append(row)
+
+    return pd.DataFrame(rows)
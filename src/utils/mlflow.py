@@ -1,4 +1,10 @@
 import mlflow
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import (
+    INVALID_PARAMETER_VALUE,
+    RESOURCE_DOES_NOT_EXIST,
+    ErrorCode,
+)
 
 
 def create_versioned_experiment(base_name="zoomcamps"):
@@ -43,3 +49,12 @@ def get_latest_versioned_experiment(base_name="zoomcamps"):
                     latest_name = exp.name
 
     return latest_name
+
+
+def is_missing_alias_error(error: Exception) -> bool:
+    # The registry reports an unset alias (or unknown model) with these codes;
+    # anything else, e.g. a database outage, must not be read as "no alias".
+    return isinstance(error, MlflowException) and error.error_code in (
+        ErrorCode.Name(INVALID_PARAMETER_VALUE),
+        ErrorCode.Name(RESOURCE_DOES_NOT_EXIST),
+    )
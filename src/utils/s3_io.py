@@ -1,6 +1,7 @@
 import pandas as pd
 from io import BytesIO
 from prefect_aws.s3 import S3Bucket
+from botocore.exceptions import ClientError
 # from datetime import datetime, timedelta
 import joblib
 
@@ -38,6 +39,12 @@ def download_joblib_from_s3(remote_path: str):
     return joblib.load(buffer)
 
 
+def is_missing_object_error(error: Exception) -> bool:
+    if not isinstance(error, ClientError):
+        return False
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey")
+
+
 # if __name__ == "__main__":
 #     today = datetime.today()
 #     yesterday = today - timedelta(days=0)
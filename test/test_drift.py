@@ -0,0 +1,94 @@
+from src.utils.drift import (
+    MIN_PSI_COUNT,
+    build_reference_profile,
+    update_running_stats,
+    compute_drift_metrics,
+)
+import numpy as np
+import pandas as pd
+
+FEATURE_COLS = ["Close", "Volume"]
+
+
+def generate_mock_stock_df(start, periods, close_offset=0, seed=42):
+    rng = np.random.default_rng(seed)
+    data = {
+        "Date": pd.date_range(start=start, periods=periods),
+        "Ticker": ["AAPL"] * periods,
+        "Close": 100 + close_offset + rng.normal(0, 1, periods),
+        "Volume": 1000000 + rng.normal(0, 1000, periods),
+    }
+    df = pd.DataFrame(data)
+    df["Next_Close"] = df["Close"] + 1
+    df["Prediction"] = df["Next_Close"]
+    return df
+
+
+def test_running_stats_match_batch_stats():
+    train_df = generate_mock_stock_df("2024-01-01", 200)
+    infer_df = generate_mock_stock_df("2024-08-01", 40, seed=7)
+    profile = build_reference_profile(train_df, FEATURE_COLS)
+
+    state = None
+    for i in range(0, len(infer_df), 5):
+        state = update_running_stats(state, infer_df.iloc[i : i + 5], profile)
+    # Re-running on an already ingested day must not double count it
+    state = update_running_stats(state, infer_df.tail(1), profile)
+
+    df_drift = compute_drift_metrics(state, profile).set_index("Column")
+
+    assert set(df_drift.index) == {"Close", "Volume", "Prediction"}
+    assert df_drift.loc["Close", "Count"] == len(infer_df)
+    assert np.isclose(df_drift.loc["Close", "Mean"], infer_df["Close"].mean())
+    assert np.isclose(df_drift.loc["Close", "Variance"], infer_df["Close"].var(ddof=0))
+
+
+def test_psi_flags_shifted_distribution():
+    train_df = generate_mock_stock_df("2024-01-01", 1000)
+    profile = build_reference_profile(train_df, FEATURE_COLS)
+
+    stable_df = generate_mock_stock_df("2024-08-01", 1000, seed=7)
+    shifted_df = generate_mock_stock_df("2024-08-01", 1000, close_offset=5, seed=7)
+    stable = compute_drift_metrics(
+        update_running_stats(None, stable_df, profile), profile
+    ).set_index("Column")
+    shifted = compute_drift_metrics(
+        update_running_stats(None, shifted_df, profile), profile
+    ).set_index("Column")
+
+    assert stable.loc["Close", "PSI"] < 0.1
+    assert shifted.loc["Close", "PSI"] > 0.25
+    assert shifted.loc["Close", "P50"] > stable.loc["Close", "P50"]
+
+
+def test_psi_stays_low_on_small_same_distribution_batches():
+    train_df = generate_mock_stock_df("2024-01-01", 300)
+    infer_df = generate_mock_stock_df("2024-08-01", 2 * MIN_PSI_COUNT, seed=7)
+    profile = build_reference_profile(train_df, FEATURE_COLS)
+
+    # One row per day, as the daily inference flow ingests them
+    state = None
+    for i in range(len(infer_df)):
+        state = update_running_stats(state, infer_df.iloc[i : i + 1], profile)
+        psi = compute_drift_metrics(state, profile).set_index("Column")
+        if i + 1 < MIN_PSI_COUNT:
+            assert np.isnan(psi.loc["Close", "PSI"])
+
+    assert psi.loc["Close", "PSI"] < 0.1
+
+
+def test_reexported_identical_profile_keeps_state():
+    train_df = generate_mock_stock_df("2024-01-01", 200)
+    infer_df = generate_mock_stock_df("2024-08-01", 40, seed=7)
+    profile = build_reference_profile(train_df, FEATURE_COLS)
+    state = update_running_stats(None, infer_df, profile)
+
+    same_profile = build_reference_profile(train_df, FEATURE_COLS)
+    state = update_running_stats(state, infer_df.tail(0), same_profile)
+    assert state["tickers"]["AAPL"]["Close"]["count"] == len(infer_df)
+
+    new_profile = build_reference_profile(
+        generate_mock_stock_df("2024-01-01", 200, seed=3), FEATURE_COLS
+    )
+    state = update_running_stats(state, infer_df.tail(0), new_profile)
+    assert state["tickers"] == {}
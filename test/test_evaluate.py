@@ -0,0 +1,28 @@
+from src.models.evaluate import build_comparison_table
+import numpy as np
+import pandas as pd
+
+
+def generate_mock_test_df():
+    data = {
+        "Ticker": ["AAPL", "AAPL", "MSFT", "MSFT"],
+        "Next_Close": [100.0, 102.0, 200.0, 204.0],
+    }
+    return pd.DataFrame(data)
+
+
+def test_build_comparison_table_per_version_and_ticker():
+    df_tst = generate_mock_test_df()
+    predictions = {
+        "1": np.array([100.0, 102.0, 200.0, 204.0]),
+        "champion": np.array([101.0, 103.0, 202.0, 206.0]),
+    }
+
+    df_comparison = build_comparison_table(df_tst, predictions)
+    rmse = df_comparison.set_index(["Version", "Ticker"])["RMSE"]
+
+    assert len(df_comparison) == 6
+    assert rmse[("1", "ALL")] == 0
+    assert np.isclose(rmse[("champion", "AAPL")], 1.0)
+    assert np.isclose(rmse[("champion", "MSFT")], 2.0)
+    assert np.isclose(rmse[("champion", "ALL")], np.sqrt(2.5))
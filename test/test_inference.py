@@ -0,0 +1,102 @@
+import src.inference as inference
+from botocore.exceptions import ClientError
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE, INTERNAL_ERROR
+from unittest.mock import MagicMock
+import pytest
+import pandas as pd
+
+
+def generate_mock_infer_df():
+    data = {
+        "Date": pd.date_range(start="2024-01-01", periods=2),
+        "Ticker": ["AAPL"] * 2,
+        "Close": [102.0, 103.0],
+    }
+    return pd.DataFrame(data)
+
+
+def fake_download(state_error):
+    def download(remote_path):
+        if remote_path == inference.DRIFT_STATE_PATH:
+            raise state_error
+        return {"version": "v1", "tickers": {}}
+
+    return download
+
+
+@pytest.mark.parametrize(
+    "state_error, expect_upload",
+    [
+        (ClientError({"Error": {"Code": "404"}}, "HeadObject"), True),
+        (ClientError({"Error": {"Code": "SlowDown"}}, "HeadObject"), False),
+        (ConnectionError("network down"), False),
+    ],
+)
+def test_drift_state_only_reset_when_missing(monkeypatch, state_error, expect_upload):
+    uploads = []
+    monkeypatch.setattr(
+        inference, "download_joblib_from_s3", fake_download(state_error)
+    )
+    monkeypatch.setattr(
+        inference, "upload_joblib_to_s3", lambda obj, path: uploads.append(path)
+    )
+
+    df_infer = generate_mock_infer_df()
+    df_prediction = pd.DataFrame({"Ticker": df_infer["Ticker"], "Prediction": 1.0})
+    inference.update_drift_statistics.fn(df_infer, df_prediction)
+
+    assert bool(uploads) == expect_upload
+
+
+def test_drift_upload_failure_does_not_raise(monkeypatch):
+    def failing_upload(obj, path):
+        raise ConnectionError("s3 unavailable")
+
+    monkeypatch.setattr(
+        inference,
+        "download_joblib_from_s3",
+        fake_download(ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")),
+    )
+    monkeypatch.setattr(inference, "upload_joblib_to_s3", failing_upload)
+
+    df_infer = generate_mock_infer_df()
+    df_prediction = pd.DataFrame({"Ticker": df_infer["Ticker"], "Prediction": 1.0})
+
+    assert inference.update_drift_statistics.fn(df_infer, df_prediction) is None
+
+
+def test_resolve_model_version_turns_aliases_into_numbers():
+    client = MagicMock()
+    client.get_model_version_by_alias.return_value = MagicMock(version=3)
+    client.search_model_versions.return_value = [
+        MagicMock(version=v) for v in (1, 5, 4)
+    ]
+
+    assert inference.resolve_model_version(2, client=client) == "2"
+    assert inference.resolve_model_version("champion", client=client) == "3"
+    assert inference.resolve_model_version("latest", client=client) == "5"
+
+
+@pytest.mark.parametrize(
+    "alias_error, expected",
+    [
+        (MlflowException("alias not found", INVALID_PARAMETER_VALUE), "latest"),
+        (MlflowException("connection reset", INTERNAL_ERROR), None),
+    ],
+)
+def test_serving_model_falls_back_only_when_alias_unset(
+    monkeypatch, alias_error, expected
+):
+    def fake_load_model(registered_model_name, version, dst_path):
+        if version == inference.CHAMPION_ALIAS:
+            raise alias_error
+        return version
+
+    monkeypatch.setattr(inference, "_load_model", fake_load_model)
+
+    if expected is None:
+        with pytest.raises(MlflowException):
+            inference.load_serving_model.fn()
+    else:
+        assert inference.load_serving_model.fn() == expected
@@ -0,0 +1,79 @@
+import src.models.register as register
+from mlflow.exceptions import MlflowException
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE, INTERNAL_ERROR
+from unittest.mock import MagicMock
+import pandas as pd
+import pytest
+
+
+def generate_mock_comparison(rmse_by_version):
+    rows = [
+        {"Version": version, "Ticker": "ALL", "RMSE": rmse}
+        for version, rmse in rmse_by_version.items()
+    ]
+    return pd.DataFrame(rows)
+
+
+def mock_client(champion_version):
+    client = MagicMock()
+    client.get_model_version_by_alias.return_value = MagicMock(version=champion_version)
+    return client
+
+
+def test_promote_champion_keeps_better_champion(monkeypatch):
+    calls = []
+
+    def fake_evaluate_models_flow(versions, prepare_data):
+        calls.append((versions, prepare_data))
+        return generate_mock_comparison({"1": 2.0, "2": 3.0})
+
+    monkeypatch.setattr(register, "evaluate_models_flow", fake_evaluate_models_flow)
+    client = mock_client(champion_version=1)
+
+    winner = register.promote_champion(client, 2)
+
+    assert winner == "1"
+    assert calls == [(["1", "2"], False)]
+    client.set_registered_model_alias.assert_not_called()
+
+
+def test_promote_champion_promotes_better_challenger(monkeypatch):
+    monkeypatch.setattr(
+        register,
+        "evaluate_models_flow",
+        lambda versions, prepare_data: generate_mock_comparison({"1": 3.0, "2": 2.0}),
+    )
+    client = mock_client(champion_version=1)
+
+    winner = register.promote_champion(client, 2)
+
+    assert winner == "2"
+    client.set_registered_model_alias.assert_called_once_with(
+        register.REGISTER_NAME, register.CHAMPION_ALIAS, "2"
+    )
+
+
+def test_promote_champion_without_champion(monkeypatch):
+    client = MagicMock()
+    client.get_model_version_by_alias.side_effect = MlflowException(
+        "Registered model alias champion not found.", INVALID_PARAMETER_VALUE
+    )
+
+    winner = register.promote_champion(client, 2)
+
+    assert winner == "2"
+    client.set_registered_model_alias.assert_called_once_with(
+        register.REGISTER_NAME, register.CHAMPION_ALIAS, "2"
+    )
+
+
+def test_promote_champion_registry_error_does_not_promote():
+    client = MagicMock()
+    client.get_model_version_by_alias.side_effect = MlflowException(
+        "could not connect to server", INTERNAL_ERROR
+    )
+
+    with pytest.raises(MlflowException):
+        register.promote_champion(client, 2)
+
+    client.set_registered_model_alias.assert_not_called()